@@ -0,0 +1,266 @@
+import os
+import time
+import tempfile
+from typing import Iterator, Tuple
+
+from right_angled_group import RAGroup
+
+
+def clique_polynomial(group: RAGroup) -> list[int]:
+    """
+    Coefficients of the clique polynomial of the commutation graph:
+    the k-th coefficient is the number of cliques with k vertices (the empty clique included).
+    """
+    generators = group.generators[:-1]
+    neighbours = {var: group.commutations[var] - {var} for var in generators}
+    coefficients = [0] * (len(generators) + 1)
+
+    def extend_clique(size: int, candidates: list[str]):
+        coefficients[size] += 1
+        for i, var in enumerate(candidates):
+            extend_clique(size + 1, [var2 for var2 in candidates[i + 1:] if var2 in neighbours[var]])
+
+    extend_clique(0, generators)
+    while coefficients[-1] == 0:
+        coefficients.pop()
+    return coefficients
+
+
+def growth_series(group: RAGroup, radius: int) -> list[int]:
+    """
+    Sphere sizes up to the radius from the growth series 1 / C(-ct / (1 + t)),
+    where C is the clique polynomial and c is 2 for artin and 1 for coxeter groups.
+    """
+    cliques = clique_polynomial(group)
+    degree = len(cliques) - 1
+    c = 2 if group.group_type == 'artin' else 1
+    binomials = [[1]]
+    for k in range(degree):
+        prev = binomials[-1]
+        binomials.append([1] + [prev[i] + prev[i + 1] for i in range(k)] + [1])
+    # W(t) * P(t) = (1 + t)^degree, where P(t) = sum_k a_k (-ct)^k (1 + t)^(degree - k)
+    denominator = [0] * (degree + 1)
+    for k, a_k in enumerate(cliques):
+        for i, binom in enumerate(binomials[degree - k]):
+            denominator[k + i] += a_k * (-c) ** k * binom
+    numerator = binomials[degree]
+    sizes = []
+    for n in range(radius + 1):
+        w_n = numerator[n] if n <= degree else 0
+        for k in range(1, min(n, degree) + 1):
+            w_n -= denominator[k] * sizes[n - k]
+        sizes.append(w_n)
+    return sizes
+
+
+"""
+Growth enumerator class
+"""
+class GrowthEnumerator:
+    """
+    Breadth-first enumeration of group elements by length on reduced pilings.
+    Every element of length n + 1 is a reduced piling of length n extended by one letter,
+    so the levels are deduplicated independently. A level larger than max_frontier
+    is spilled to disk in hash buckets and deduplicated bucket by bucket.
+    """
+    # canonical form: one byte per bead (value + 1) and SEPARATOR after every column
+    SEPARATOR = 3
+
+    def __init__(
+            self,
+            group: RAGroup,
+            max_frontier: int=10**6,
+            spill_dir: str=None,
+            n_buckets: int=16,
+            verbose: bool=True
+    ):
+        self.group = group
+        self.max_frontier = max_frontier
+        self.spill_dir = spill_dir
+        self.n_buckets = n_buckets
+        self.verbose = verbose
+        self.generators = group.generators[:-1]
+        column_index = {var: i for i, var in enumerate(self.generators)}
+        self.uncommutations = [
+            [column_index[var2] for var2 in group.uncommutations[var]] for var in self.generators
+        ]
+        signs = (1, -1) if group.group_type == 'artin' else (1,)
+        self.letters = [(i, eps) for i in range(len(self.generators)) for eps in signs]
+        self.stats = []
+
+    def canonical(self, piling: Tuple[Tuple[int]]) -> bytes:
+        out = bytearray()
+        for stack in piling:
+            out.extend(value + 1 for value in stack)
+            out.append(self.SEPARATOR)
+        return bytes(out)
+
+    def decode(self, state: bytes) -> Tuple[Tuple[int]]:
+        piling = []
+        stack = []
+        for byte in state:
+            if byte == self.SEPARATOR:
+                piling.append(tuple(stack))
+                stack = []
+            else:
+                stack.append(byte - 1)
+        return tuple(piling)
+
+    def extend(self, state: bytes) -> Iterator[bytes]:
+        """
+        Canonical forms of the reduced pilings one letter longer than state.
+        Works on the bytes of the columns directly, without decoding the piling.
+        """
+        separator = bytes((self.SEPARATOR,))
+        columns = state.split(separator)
+        for var, eps in self.letters:
+            stack = columns[var]
+            if stack and (stack[-1] == 1 - eps if self.group.group_type == 'artin' else stack[-1] != 1):
+                continue
+            child = columns.copy()
+            child[var] = stack + bytes((eps + 1,))
+            for var2 in self.uncommutations[var]:
+                child[var2] = columns[var2] + b'\x01'
+            yield separator.join(child)
+
+    def representative(self, state: bytes) -> str:
+        """
+        Reduced word of the element, written with powers.
+        """
+        var_power = []
+        for column, eps in self.group.reduced_letters(self.decode(state)):
+            var = self.generators[column]
+            if var_power and var_power[-1][0] == var:
+                var_power[-1][1] += eps
+            else:
+                var_power.append([var, eps])
+        if not var_power:
+            return '1'
+        return ' '.join(var if power == 1 else f'{var}^{{{power}}}' for var, power in var_power)
+
+    def bucket_path(self, spill_dir: str, n: int, bucket: int, suffix: str) -> str:
+        return os.path.join(spill_dir, f'{n:0>6}_{bucket:0>4}.{suffix}')
+
+    def read_states(self, level: set[bytes] | list[str]) -> Iterator[bytes]:
+        if isinstance(level, set):
+            yield from level
+            return
+        for path in level:
+            with open(path, 'rb') as f:
+                for line in f:
+                    yield line[:-1]
+
+    def spill(self, states: set[bytes], spill_dir: str, n: int) -> list:
+        buckets = [open(self.bucket_path(spill_dir, n, b, 'raw'), 'wb') for b in range(self.n_buckets)]
+        for state in states:
+            buckets[hash(state) % self.n_buckets].write(state + b'\n')
+        return buckets
+
+    def deduplicate(self, buckets: list, spill_dir: str, n: int) -> Tuple[list[str], int]:
+        paths = []
+        count = 0
+        for b, bucket in enumerate(buckets):
+            bucket.close()
+            with open(bucket.name, 'rb') as f:
+                states = set(line[:-1] for line in f)
+            os.remove(bucket.name)
+            path = self.bucket_path(spill_dir, n, b, 'level')
+            with open(path, 'wb') as f:
+                for state in states:
+                    f.write(state + b'\n')
+            paths.append(path)
+            count += len(states)
+        return paths, count
+
+    def remove_level(self, level: set[bytes] | list[str]):
+        if not isinstance(level, set):
+            for path in level:
+                os.remove(path)
+
+    def levels(self, radius: int) -> Iterator[Tuple[int, set[bytes] | list[str]]]:
+        """
+        Yields (n, level) for n = 0..radius, where level is a set of canonical forms
+        or a list of spilled level files, readable with read_states.
+        """
+        expected = growth_series(self.group, radius)
+        self.stats = []
+        with tempfile.TemporaryDirectory(dir=self.spill_dir) as spill_dir:
+            level = {self.canonical(tuple(() for _ in self.generators))}
+            self.report(0, 1, expected[0], 0, 0.)
+            yield 0, level
+            for n in range(1, radius + 1):
+                start = time.perf_counter()
+                next_level = set()
+                buckets = None
+                expanded = 0
+                for state in self.read_states(level):
+                    expanded += 1
+                    for child in self.extend(state):
+                        if buckets is None:
+                            next_level.add(child)
+                            if len(next_level) > self.max_frontier:
+                                buckets = self.spill(next_level, spill_dir, n)
+                                next_level = None
+                        else:
+                            buckets[hash(child) % self.n_buckets].write(child + b'\n')
+                self.remove_level(level)
+                if buckets is None:
+                    level, count = next_level, len(next_level)
+                else:
+                    level, count = self.deduplicate(buckets, spill_dir, n)
+                self.report(n, count, expected[n], expanded, time.perf_counter() - start)
+                yield n, level
+            self.remove_level(level)
+
+    def report(self, n: int, count: int, expected: int, expanded: int, elapsed: float):
+        throughput = expanded / elapsed if elapsed > 0 else 0.
+        self.stats.append({
+            'radius': n,
+            'count': count,
+            'expected': expected,
+            'expanded': expanded,
+            'seconds': elapsed,
+            'throughput': throughput
+        })
+        if self.verbose:
+            check = 'ok' if count == expected else f'MISMATCH, expected {expected}'
+            print(f'radius {n}: {count} elements ({check}), {throughput:.0f} pilings/s')
+
+    def sphere_sizes(self, radius: int) -> list[int]:
+        return [self.stats[-1]['count'] for _ in self.levels(radius)]
+
+    def ball(self, radius: int) -> Iterator[Tuple[int, str]]:
+        for n, level in self.levels(radius):
+            for state in self.read_states(level):
+                yield n, self.representative(state)
+
+    def cross_check(self, radius: int) -> list[Tuple[int, int, int]]:
+        """
+        Returns (radius, counted, expected) for every radius where the enumeration
+        disagrees with the growth series, an empty list if everything agrees.
+        """
+        self.sphere_sizes(radius)
+        return [
+            (stat['radius'], stat['count'], stat['expected'])
+            for stat in self.stats if stat['count'] != stat['expected']
+        ]
+
+
+if __name__ == '__main__':
+    generators = [f's_{i}' for i in range(1, 7)]
+    commutations = [
+        ('s_1', 's_4'),
+        ('s_1', 's_5'),
+        ('s_2', 's_5'),
+        ('s_2', 's_6'),
+        ('s_3', 's_6'),
+        ('s_3', 's_4')
+    ]
+    coxeter_group = RAGroup(generators, commutations, 'coxeter')
+    artin_group = RAGroup(generators, commutations, 'artin')
+
+    print(growth_series(coxeter_group, 10))
+    GrowthEnumerator(coxeter_group).sphere_sizes(10)
+    GrowthEnumerator(artin_group).sphere_sizes(6)
+    for n, word in GrowthEnumerator(coxeter_group, verbose=False).ball(2):
+        print(n, word)
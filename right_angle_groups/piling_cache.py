@@ -0,0 +1,56 @@
+from collections import OrderedDict
+from typing import Hashable
+
+
+"""
+Piling cache class
+"""
+class PilingCache:
+    """
+    Bounded mapping with least recently used eviction, used by RAGroup to keep
+    compiled words and their reduced pilings. Counts hits, misses and evictions.
+    """
+    def __init__(self, maxsize: int=1024):
+        if maxsize <= 0:
+            raise ValueError(f'cache size should be positive, got {maxsize}')
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: Hashable):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Hashable, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def info(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self.entries),
+            'maxsize': self.maxsize,
+            'hit_rate': self.hits / lookups if lookups else 0.
+        }
@@ -0,0 +1,87 @@
+import time
+from typing import Callable
+
+
+"""
+Piling statistics class
+"""
+class PilingStats:
+    """
+    Optional instrumentation for RAGroup.generate_piling. Counts pushes, pops and
+    zero placeholder writes per generator, tracks stack heights and the fan-out of
+    the touched uncommuting stacks, and times the parse, validate and pile phases.
+    After every word a report dict is stored in reports and passed to the callback.
+    """
+    COUNTERS = ('pushes', 'pops', 'zero_writes', 'zero_pops')
+
+    def __init__(self, callback: Callable[[dict], None]=None):
+        self.callback = callback
+        self.reports = []
+
+    def start(self, expression: str, generators: list[str]):
+        self.expression = expression
+        self.counters = {name: {var: 0 for var in generators} for name in self.COUNTERS}
+        self.letters = {var: 0 for var in generators}
+        self.peak_height = {var: 0 for var in generators}
+        self.height_sum = {var: 0 for var in generators}
+        self.n_samples = 0
+        self.times = {}
+        self.last_time = time.perf_counter()
+
+    def lap(self, phase: str):
+        now = time.perf_counter()
+        self.times[phase] = self.times.get(phase, 0.) + now - self.last_time
+        self.last_time = now
+
+    def push(self, var: str, fanout: int):
+        self.letters[var] += 1
+        self.counters['pushes'][var] += 1
+        self.counters['zero_writes'][var] += fanout
+
+    def pop(self, var: str, fanout: int):
+        self.letters[var] += 1
+        self.counters['pops'][var] += 1
+        self.counters['zero_pops'][var] += fanout
+
+    def sample(self, piling: dict[str, list[int]]):
+        self.n_samples += 1
+        for var, stack in piling.items():
+            height = len(stack)
+            self.height_sum[var] += height
+            if height > self.peak_height[var]:
+                self.peak_height[var] = height
+
+    def finish(self) -> dict:
+        n_samples = max(self.n_samples, 1)
+        fanout = {}
+        for var, letters in self.letters.items():
+            touched = self.counters['zero_writes'][var] + self.counters['zero_pops'][var]
+            fanout[var] = touched / letters if letters else 0.
+        report = {
+            'word': self.expression,
+            'letters': sum(self.letters.values()),
+            **{name: dict(counter) for name, counter in self.counters.items()},
+            'fanout': fanout,
+            'peak_height': dict(self.peak_height),
+            'average_height': {var: total / n_samples for var, total in self.height_sum.items()},
+            'times': dict(self.times)
+        }
+        self.reports.append(report)
+        if self.callback is not None:
+            self.callback(report)
+        return report
+
+    def summary(self) -> dict:
+        """
+        Totals of the counters per generator and of the phase times over all reported words.
+        """
+        summary = {name: {} for name in self.COUNTERS}
+        summary['times'] = {}
+        for report in self.reports:
+            for name in self.COUNTERS:
+                for var, count in report[name].items():
+                    summary[name][var] = summary[name].get(var, 0) + count
+            for phase, seconds in report['times'].items():
+                summary['times'][phase] = summary['times'].get(phase, 0.) + seconds
+        summary['words'] = len(self.reports)
+        return summary
@@ -4,6 +4,7 @@ from collections import defaultdict
 from math import cos, sin, pi, sqrt
 
 import imageio
+import numpy as np
 import networkx as nx
 from matplotlib import rc
 import matplotlib.pyplot as plt
@@ -13,6 +14,8 @@ rc('text',usetex=True)
 rc('text.latex', preamble=r'\usepackage{amsmath}')
 
 from word import Word
+from piling_stats import PilingStats
+from piling_cache import PilingCache
 
 
 """
@@ -23,7 +26,8 @@ class RAGroup:
             self, 
             generators: list[str], 
             commutations: list[Tuple[str]],
-            group_type: str
+            group_type: str,
+            cache_size: int=1024
     ):
         self.group_type = group_type
         if group_type not in ('artin', 'coxeter'):
@@ -44,6 +48,12 @@ class RAGroup:
         self.uncommutations = {}
         for generator in self.generators:
             self.uncommutations[generator] = self.generators_set - self.commutations[generator]
+        # column indices of the piling, used by the compiled words
+        self.column_index = {generator: idx for idx, generator in enumerate(generators)}
+        self.uncommuting_columns = [
+            [self.column_index[var2] for var2 in self.uncommutations[var]] for var in generators
+        ]
+        self.cache = PilingCache(cache_size) if cache_size else None
                 
     def unknown_generators(self, word):
         for variable in word.variables:
@@ -69,176 +79,465 @@ class RAGroup:
         word: str, 
         animate: bool=False, 
         max_stack_len: int=None, 
-        dir_path: str=None
+        dir_path: str=None,
+        usetex: bool=True,
+        stats: PilingStats=None
     ) -> dict[str, list[str]]:
+        if self.cache is not None and not animate and stats is None:
+            entry = self.piling_entry(word)
+            piling = {var: list(stack) for var, stack in zip(self.generators[:-1], entry['piling'])}
+            return piling, max(max_stack_len or 0, entry['max_stack_len'])
+        if stats is not None:
+            stats.start(word, self.generators[:-1])
         word = Word(word, verbose=False)
+        if stats is not None:
+            stats.lap('parse')
         
         self.unknown_generators(word)
+        if stats is not None:
+            stats.lap('validate')
         if max_stack_len is None:
             max_stack_len = 0
         piling = {generator: [] for generator in self.generators if generator != '1'}
-        frame = 0
+        # trace entries: (letter index, current generator, changed columns)
+        trace = []
         if animate:
-            formatted_word = word.format_word(-1)
-            self.plot_piling(piling, max_stack_len, formatted_word, '_', f'{dir_path}/{frame:0>6}')
-            frame += 1
+            trace.append((-1, '_', {var: () for var in piling}))
         for idx, (var, power) in enumerate(word.var_power):
             eps = self.sign(power)
             for _ in range(abs(power)):
                 if self.piling_pop_condition(piling, var, eps):
+                    if stats is not None:
+                        stats.pop(var, sum(1 for var2 in self.uncommutations[var] if piling[var2]))
                     if piling[var]:
                         piling[var].pop()
                     for var2 in self.uncommutations[var]:
                         if piling[var2]:
                             piling[var2].pop()
                 else:
+                    if stats is not None:
+                        stats.push(var, len(self.uncommutations[var]))
                     piling[var].append(eps)
                     max_stack_len = max(max_stack_len, len(piling[var]))
                     for var2 in self.uncommutations[var]:
                         piling[var2].append(0)
                         max_stack_len = max(max_stack_len, len(piling[var2]))
+                if stats is not None:
+                    stats.sample(piling)
                 if animate:
-                    formatted_word = word.format_word(idx)
-                    self.plot_piling(piling, max_stack_len, formatted_word, var, f'{dir_path}/{frame:0>6}')
-                frame += 1
+                    columns = {var2: tuple(piling[var2]) for var2 in self.uncommutations[var]}
+                    columns[var] = tuple(piling[var])
+                    trace.append((idx, var, columns))
 
-                        
+        if stats is not None:
+            stats.lap('pile')
+        if animate:
+            self.render_trace(word, trace, max_stack_len, dir_path, usetex)
+            if stats is not None:
+                stats.lap('render')
+        if stats is not None:
+            stats.finish()
         return piling, max_stack_len
-    
+
+    def compile_word(self, expression: str, use_cache: bool=True) -> dict:
+        """
+        Compiled form of the expression: letters as (column index, sign, power) runs, so long
+        powers are not expanded.
+        The reduced piling is added lazily by piling_entry. Entries are kept in the group cache,
+        use_cache=False compiles without looking up or inserting, e.g. for one-off batch words.
+        """
+        use_cache = use_cache and self.cache is not None
+        entry = self.cache.get(expression) if use_cache else None
+        if entry is None:
+            word = Word(expression, verbose=False)
+            self.unknown_generators(word)
+            letters = tuple(
+                (self.column_index[var], self.sign(power), abs(power))
+                for var, power in word.var_power if power != 0
+            )
+            entry = {'letters': letters, 'piling': None, 'max_stack_len': None}
+            if use_cache:
+                self.cache.put(expression, entry)
+        return entry
+
+    def apply_letter(self, piling: list[list[int]], var: int, eps: int) -> int:
+        """
+        Applies one letter to a piling indexed by columns.
+        Returns the highest touched stack after a push and 0 after a pop.
+        """
+        if self.piling_pop_condition(piling, var, eps):
+            if piling[var]:
+                piling[var].pop()
+            for var2 in self.uncommuting_columns[var]:
+                if piling[var2]:
+                    piling[var2].pop()
+            return 0
+        piling[var].append(eps)
+        height = len(piling[var])
+        for var2 in self.uncommuting_columns[var]:
+            piling[var2].append(0)
+            height = max(height, len(piling[var2]))
+        return height
+
+    def piling_entry(self, expression: str) -> dict:
+        entry = self.compile_word(expression)
+        if entry['piling'] is None:
+            piling = [[] for _ in self.column_index]
+            max_stack_len = 0
+            for var, eps, power in entry['letters']:
+                for _ in range(power):
+                    max_stack_len = max(max_stack_len, self.apply_letter(piling, var, eps))
+            entry['piling'] = tuple(map(tuple, piling))
+            entry['max_stack_len'] = max_stack_len
+        return entry
+
+    def reduced_letters(self, piling: Tuple[Tuple[int]]) -> list[Tuple[int, int]]:
+        """
+        Reduced word of a piling indexed by columns, as (column index, sign) pairs:
+        peels off letters whose bead is on the top of its stack.
+        """
+        piling = [list(stack) for stack in piling]
+        letters = []
+        while any(piling):
+            var = max(i for i, stack in enumerate(piling) if stack and stack[-1] != 0)
+            letters.append((var, piling[var].pop()))
+            for var2 in self.uncommuting_columns[var]:
+                piling[var2].pop()
+        letters.reverse()
+        return letters
+
+    def compose_pilings(self, piling: Tuple[Tuple[int]], other: Tuple[Tuple[int]]) -> Tuple[Tuple[int]]:
+        result = [list(stack) for stack in piling]
+        for var, eps in self.reduced_letters(other):
+            self.apply_letter(result, var, eps)
+        return tuple(map(tuple, result))
+
+    def power_entry(self, expression: str, k: int) -> Tuple[Tuple[int]]:
+        """
+        Piling of the k-th power of the expression, composed by squaring from cached pilings.
+        Powers are cached under the (expression, k) key. In coxeter groups the signs
+        of the beads may differ from generate_piling of the expanded word, as s = s^{-1}.
+        """
+        if k == 1:
+            return self.piling_entry(expression)['piling']
+        if k == 0:
+            return tuple(() for _ in self.column_index)
+        key = (expression, k)
+        piling = self.cache.get(key) if self.cache is not None else None
+        if piling is None:
+            if k < 0:
+                inverse = [[] for _ in self.column_index]
+                for var, eps in reversed(self.reduced_letters(self.power_entry(expression, -k))):
+                    self.apply_letter(inverse, var, -eps)
+                piling = tuple(map(tuple, inverse))
+            else:
+                half = self.power_entry(expression, k // 2)
+                piling = self.compose_pilings(half, half)
+                if k % 2:
+                    piling = self.compose_pilings(piling, self.power_entry(expression, 1))
+            if self.cache is not None:
+                self.cache.put(key, piling)
+        return piling
+
+    def power_piling(self, expression: str, k: int) -> dict[str, list[int]]:
+        piling = self.power_entry(expression, k)
+        return {var: list(stack) for var, stack in zip(self.generators[:-1], piling)}
+
+    def encode_words(self, words: list[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Encodes a batch of words as two integer matrices of shape (n_words, max_len):
+        generator indices (in the piling column order, -1 for padding) and letter signs.
+        Powers are expanded, so every column is exactly one letter.
+        Batch words are usually one-off, so they bypass the group cache.
+        """
+        encoded = []
+        for expression in words:
+            letters = []
+            for var, eps, power in self.compile_word(expression, use_cache=False)['letters']:
+                letters.extend([(var, eps)] * power)
+            encoded.append(letters)
+        max_len = max((len(letters) for letters in encoded), default=0)
+        indices = np.full((len(encoded), max_len), -1, dtype=np.int32)
+        signs = np.zeros((len(encoded), max_len), dtype=np.int8)
+        for row, letters in enumerate(encoded):
+            if letters:
+                indices[row, :len(letters)], signs[row, :len(letters)] = zip(*letters)
+        return indices, signs
+
+    def generate_piling_batch(
+        self,
+        words: list[str] | tuple[str, ...] | Tuple[np.ndarray, np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vectorized version of generate_piling for many words over this group.
+        Applies each letter position to every word at once with masked push/pop
+        on preallocated stacks. Accepts either expressions or the output of encode_words.
+        Returns per-word identity flags, final stack heights of shape (n_words, n_generators)
+        and max_stack_len, matching generate_piling.
+        """
+        # the output of encode_words is a pair of arrays, any other sequence holds expressions
+        if isinstance(words, tuple) and len(words) == 2 and isinstance(words[0], np.ndarray):
+            indices, signs = words
+        else:
+            indices, signs = self.encode_words(words)
+        n_words, n_letters = indices.shape
+        columns = self.generators[:-1]
+        n_columns = len(columns)
+        # uncommuting[i, j] is True when generator j does not commute with generator i
+        uncommuting = np.zeros((n_columns, n_columns), dtype=bool)
+        for i, var in enumerate(columns):
+            for j, var2 in enumerate(columns):
+                uncommuting[i, j] = var2 in self.uncommutations[var]
+        identity = np.eye(n_columns, dtype=bool)
+
+        # a stack grows by at most one bead per letter
+        stacks = np.zeros((n_words, n_columns, max(n_letters, 1)), dtype=np.int8)
+        heights = np.zeros((n_words, n_columns), dtype=np.int32)
+        max_stack_len = np.zeros(n_words, dtype=np.int32)
+        rows = np.arange(n_words)
+        for t in range(n_letters):
+            var = indices[:, t]
+            eps = signs[:, t]
+            active = var >= 0
+            var = np.where(active, var, 0)
+            var_height = heights[rows, var]
+            top = stacks[rows, var, np.maximum(var_height - 1, 0)]
+            if self.group_type == 'artin':
+                pop = active & (var_height > 0) & (top == -eps)
+            else:
+                pop = active & (var_height > 0) & (top != 0)
+            push = active & ~pop
+
+            own = identity[var]
+            neighbours = uncommuting[var]
+            heights -= (pop[:, None] & (own | neighbours) & (heights > 0))
+
+            write = push[:, None] & (own | neighbours)
+            word_idx, column_idx = np.nonzero(write)
+            stacks[word_idx, column_idx, heights[word_idx, column_idx]] = \
+                np.where(own[word_idx, column_idx], eps[word_idx], 0)
+            heights += write
+            np.maximum(max_stack_len, heights.max(axis=1, initial=0), out=max_stack_len)
+
+        is_identity = ~heights.any(axis=1)
+        return is_identity, heights, max_stack_len
+
     def plot_piling(
         self, 
         piling: dict[str, list[int]], 
         max_height: int, 
         formatted_word: str,
         cur_var: str,
-        fname: str
+        fname: str,
+        usetex: bool=True
+    ):
+        figure = PilingFigure(self, max_height, usetex)
+        for var, stack in piling.items():
+            figure.set_column(var, stack)
+        figure.highlight(cur_var)
+        figure.set_word(formatted_word)
+        figure.save(fname)
+        figure.close()
+
+    def render_trace(
+        self,
+        word: Word,
+        trace: list[Tuple[int, str, dict[str, Tuple[int]]]],
+        max_height: int,
+        dir_path: str,
+        usetex: bool=True
     ):
-        fig, (ax, ax_graph) = plt.subplots(
+        """
+        Saves one frame per trace entry. The static layer is drawn once,
+        each frame only redraws the changed piling columns and the highlighted edges.
+        """
+        figure = PilingFigure(self, max_height, usetex)
+        for frame, (idx, cur_var, columns) in enumerate(trace):
+            for var, stack in columns.items():
+                figure.set_column(var, stack)
+            figure.highlight(cur_var)
+            figure.set_word(word.format_word(idx))
+            figure.save(f'{dir_path}/{frame:0>6}')
+        figure.close()
+        
+    def animate_folder(self, folder_path: str, output_file: str, show_ani: bool=False, animation_speed: float=1.0):
+        image_files = sorted([f for f in os.listdir(folder_path) if f.endswith(('png'))])
+        images = [imageio.imread(os.path.join(folder_path, file)) for file in image_files]
+        fig, ax = plt.subplots()
+        ax.axis('off')
+        img_display = ax.imshow(images[0])
+        def update(frame):
+            img_display.set_array(images[frame])
+            return img_display,
+        if animation_speed < 0.1 or animation_speed > 10:
+            raise ValueError('animation speed should be in range (0.1, 10)')
+        frame_interval = 1000. / animation_speed
+        ani = animation.FuncAnimation(fig, update, frames=len(images), interval=frame_interval, blit=True)
+        ani.save(output_file, writer='imagemagick', savefig_kwargs={'pad_inches': 0})
+
+        if show_ani:
+            plt.show()
+            plt.close()
+        else:
+            plt.close()
+    
+    def animate_piling(
+        self, 
+        word: str, 
+        dir_path: str, 
+        show_ani: bool=False, 
+        animation_speed: float=1.0, 
+        usetex: bool=True
+    ):
+        self.generate_piling(word, True, dir_path=dir_path, usetex=usetex)
+        self.animate_folder(dir_path, f'{dir_path}/animation.gif', show_ani, animation_speed)
+        
+
+"""
+Piling figure class
+"""
+class PilingFigure:
+    def __init__(self, group: RAGroup, max_height: int, usetex: bool=True):
+        self.group = group
+        self.max_height = max_height
+        self.usetex = usetex
+        # mathtext has no visible bold italic, fall back to upright bold
+        self.bold_command = r'\boldsymbol' if usetex else r'\mathbf'
+        self.node_radius = 0.2
+        self.fig, (self.ax, self.ax_graph) = plt.subplots(
             1, 2, figsize=(10, 5),
         )
+        columns = group.generators[:-1]
+        self.column_index = {var: i for i, var in enumerate(columns)}
+        self.beads = {var: [] for var in columns}
+        self.red_edges = {}
+        self.cur_var = None
+        self.formatted_word = None
+        self.bbox = None
         
-        
-        # plot piling
-        for stack_index, stack in enumerate(piling.values()):
+        # static piling layer
+        ax = self.ax
+        for stack_index in range(len(columns)):
             line = plt.Line2D(
                 [stack_index, stack_index], 
                 [-1, max_height - .2], 
                 color='black', 
                 zorder=0)
             ax.add_line(line)
-            for level_index, value in enumerate(stack):
-                x = stack_index
-                y = max_height - level_index - 1
-                circle = plt.Circle((x, y), 0.4, color='white', ec='black', zorder=1)
-                ax.add_patch(circle)
-                if value == 1:
-                    ax.plot([x - 0.2, x + 0.2], [y, y], color='red', linewidth=2, zorder=2)
-                    ax.plot([x, x], [y - 0.2, y + 0.2], color='red', linewidth=2, zorder=2)
-                elif value == -1:
-                    ax.plot([x - 0.2, x + 0.2], [y, y], color='red', linewidth=2, zorder=2)
-        piling_keys = list(piling)
-        for i in range(len(piling)):
-            if piling_keys[i] != cur_var:
-                ax.text(i, -1.5, f'${piling_keys[i]}$', ha='center', va='center', fontsize=14, zorder=3)
-            else:
-                stack_label = r'$\boldsymbol{' + piling_keys[i] + '}$'
-                ax.text(i, -1.5, stack_label, ha='center', va='center', fontsize=14, zorder=3)
+        self.stack_labels = {}
+        for i, var in enumerate(columns):
+            self.stack_labels[var] = (
+                ax.text(i, -1.5, f'${var}$', ha='center', va='center', fontsize=14, zorder=3, usetex=usetex),
+                ax.text(i, -1.5, f'${self.bold_command}{{{var}}}$', ha='center', va='center', fontsize=14, zorder=3, 
+                        usetex=usetex, visible=False)
+            )
         horizontal_line = plt.Line2D(
-            [-1, len(piling)], 
+            [-1, len(columns)], 
             [max_height - .2, max_height - .2], 
             linewidth=4, 
             color='black', 
             zorder=0)
         ax.add_line(horizontal_line)
-        ax.set_xlim(-1, len(piling))
+        ax.set_xlim(-1, len(columns))
         ax.set_ylim(-1, max_height)
         ax.set_aspect('equal', 'box')
         ax.invert_yaxis() 
         ax.axis('off')
         
-        # plot graph
+        # static graph layer
+        ax_graph = self.ax_graph
         G = nx.Graph()
-        num_nodes = len(piling)
-        angle_step = 2 * pi / num_nodes
-        node_positions = {}
-        node_radius = 0.2
-        # plot nodes
-        for i, node_key in enumerate(piling.keys()):
-            x = cos(i * angle_step)
-            y = sin(i * angle_step)
-            node_positions[node_key] = (x, y)
-            if node_key != cur_var:
-                G.add_node(node_key, pos=(x, y), label=f'${node_key}$')
-            else:
-                node_text = r'$\boldsymbol{' + node_key + '}$'
-                G.add_node(node_key, pos=(x, y), label=node_text)
-        G.add_edges_from(self.commutations_diagram)
-        pos = nx.get_node_attributes(G, 'pos')
-        labels = nx.get_node_attributes(G, 'label')
-        nx.draw_networkx_nodes(G, pos, ax=ax_graph, node_size=1000, node_color='skyblue', alpha=0.7)
-        # plot commuting edges
-        for edge in G.edges():
-            x0, y0 = pos[edge[0]]
-            x1, y1 = pos[edge[1]]
-            vec_x, vec_y = x1 - x0, y1 - y0
-            length = sqrt(vec_x**2 + vec_y**2)
-            norm_x, norm_y = vec_x / length, vec_y / length
-            start_x = x0 + norm_x * node_radius
-            start_y = y0 + norm_y * node_radius
-            end_x = x1 - norm_x * node_radius
-            end_y = y1 - norm_y * node_radius
-            ax_graph.plot([start_x, end_x], [start_y, end_y], color='black', zorder=0)
-        nx.draw_networkx_labels(G, pos, labels, font_size=14, font_weight='bold', font_color='black')
-        padding = 1.2 * node_radius
+        angle_step = 2 * pi / len(columns)
+        self.node_positions = {}
+        for i, var in enumerate(columns):
+            self.node_positions[var] = (cos(i * angle_step), sin(i * angle_step))
+            G.add_node(var)
+        G.add_edges_from(group.commutations_diagram)
+        nx.draw_networkx_nodes(G, self.node_positions, ax=ax_graph, node_size=1000, node_color='skyblue', alpha=0.7)
+        for var0, var1 in G.edges():
+            ax_graph.plot(*self.edge_segment(var0, var1), color='black', zorder=0)
+        self.node_labels = {}
+        for var, (x, y) in self.node_positions.items():
+            self.node_labels[var] = (
+                ax_graph.text(x, y, f'${var}$', ha='center', va='center', fontsize=14, fontweight='bold', 
+                              usetex=usetex),
+                ax_graph.text(x, y, f'${self.bold_command}{{{var}}}$', ha='center', va='center', fontsize=14, 
+                              fontweight='bold', usetex=usetex, visible=False)
+            )
+        padding = 1.2 * self.node_radius
         ax_graph.set_xlim(-1 - padding, 1 + padding)
-        ax_graph.set_ylim(-1 - padding, 1 + padding)
         ax_graph.set_aspect('equal', 'box')
-        # plot noncommuting edges
-        for var2 in self.uncommutations.get(cur_var, []):
-            x0, y0 = pos[cur_var]
-            x1, y1 = pos[var2]
-            vec_x, vec_y = x1 - x0, y1 - y0
-            length = sqrt(vec_x**2 + vec_y**2)
-            norm_x, norm_y = vec_x / length, vec_y / length
-            start_x = x0 + norm_x * node_radius
-            start_y = y0 + norm_y * node_radius
-            end_x = x1 - norm_x * node_radius
-            end_y = y1 - norm_y * node_radius
-            ax_graph.plot([start_x, end_x], [start_y, end_y], color='red', zorder=0, linewidth=2)
-        
         ax_graph.set_ylim(-2, 1.24)
         ax_graph.axis('off')
-        
-        ax_graph.text(0, -1.3 - padding, formatted_word, ha='center', va='center', fontsize=14)
-
-        plt.savefig(fname, bbox_inches='tight')
-        plt.close()
-        
-    def animate_folder(self, folder_path: str, output_file: str, show_ani: bool=False, animation_speed: float=1.0):
-        image_files = sorted([f for f in os.listdir(folder_path) if f.endswith(('png'))])
-        images = [imageio.imread(os.path.join(folder_path, file)) for file in image_files]
-        fig, ax = plt.subplots()
-        ax.axis('off')
-        img_display = ax.imshow(images[0])
-        def update(frame):
-            img_display.set_array(images[frame])
-            return img_display,
-        if animation_speed < 0.1 or animation_speed > 10:
-            raise ValueError('animation speed should be in range (0.1, 10)')
-        frame_interval = 1000. / animation_speed
-        ani = animation.FuncAnimation(fig, update, frames=len(images), interval=frame_interval, blit=True)
-        ani.save(output_file, writer='imagemagick', savefig_kwargs={'pad_inches': 0})
-
-        if show_ani:
-            plt.show()
-            plt.close()
-        else:
-            plt.close()
+        self.word_text = ax_graph.text(0, -1.3 - padding, '', ha='center', va='center', fontsize=14, usetex=usetex)
     
-    def animate_piling(self, word: str, dir_path: str, show_ani: bool=False, animation_speed: float=1.0):
-        piling, max_stack_len = self.generate_piling(word)
-        self.generate_piling(word, True, max_stack_len, dir_path)
-        self.animate_folder(dir_path, f'{dir_path}/animation.gif', show_ani, animation_speed)
+    def edge_segment(self, var0: str, var1: str) -> Tuple[list[float], list[float]]:
+        x0, y0 = self.node_positions[var0]
+        x1, y1 = self.node_positions[var1]
+        vec_x, vec_y = x1 - x0, y1 - y0
+        length = sqrt(vec_x**2 + vec_y**2)
+        norm_x, norm_y = vec_x / length, vec_y / length
+        start_x = x0 + norm_x * self.node_radius
+        start_y = y0 + norm_y * self.node_radius
+        end_x = x1 - norm_x * self.node_radius
+        end_y = y1 - norm_y * self.node_radius
+        return [start_x, end_x], [start_y, end_y]
+    
+    def set_column(self, var: str, stack: list[int]):
+        for artist in self.beads[var]:
+            artist.remove()
+        beads = []
+        ax = self.ax
+        x = self.column_index[var]
+        for level_index, value in enumerate(stack):
+            y = self.max_height - level_index - 1
+            circle = plt.Circle((x, y), 0.4, color='white', ec='black', zorder=1)
+            ax.add_patch(circle)
+            beads.append(circle)
+            if value != 0:
+                beads.extend(ax.plot([x - 0.2, x + 0.2], [y, y], color='red', linewidth=2, zorder=2))
+            if value == 1:
+                beads.extend(ax.plot([x, x], [y - 0.2, y + 0.2], color='red', linewidth=2, zorder=2))
+        self.beads[var] = beads
+    
+    def set_highlight(self, var: str, visible: bool):
+        if var not in self.column_index:
+            return
+        for normal, bold in (self.stack_labels[var], self.node_labels[var]):
+            normal.set_visible(not visible)
+            bold.set_visible(visible)
+        if var not in self.red_edges:
+            self.red_edges[var] = [
+                line
+                for var2 in self.group.uncommutations[var]
+                for line in self.ax_graph.plot(
+                    *self.edge_segment(var, var2), color='red', zorder=0, linewidth=2
+                )
+            ]
+        for line in self.red_edges[var]:
+            line.set_visible(visible)
+    
+    def highlight(self, cur_var: str):
+        if cur_var == self.cur_var:
+            return
+        if self.cur_var is not None:
+            self.set_highlight(self.cur_var, False)
+        self.set_highlight(cur_var, True)
+        self.cur_var = cur_var
+    
+    def set_word(self, formatted_word: str):
+        if formatted_word != self.formatted_word:
+            self.word_text.set_text(formatted_word.replace(r'\boldsymbol', self.bold_command))
+            self.formatted_word = formatted_word
+    
+    def save(self, fname: str):
+        # tight bounding box is computed once, so all frames share the same size
+        if self.bbox is None:
+            self.bbox = self.fig.get_tightbbox(self.fig.canvas.get_renderer()).padded(0.1)
+        self.fig.savefig(fname, bbox_inches=self.bbox)
+    
+    def close(self):
+        plt.close(self.fig)
         
 
 if __name__ == '__main__':